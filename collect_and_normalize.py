@@ -5,20 +5,130 @@
 自动扫描测试结果目录，批量处理并生成归一化指标
 """
 
-import pandas as pd
+import os
+import sys
+import fnmatch
+import functools
 import pathlib
 import argparse
 from datetime import datetime
-from typing import Optional
-from normalize_metrics import NormalizedMetrics
+from typing import TYPE_CHECKING, Dict, Optional
 
+# pandas / pyarrow / normalize_metrics 在实际处理时才导入，--help 等无需承担加载开销
+if TYPE_CHECKING:
+    import pandas as pd
 
-def find_latest_csv(directory: pathlib.Path, pattern: str) -> Optional[pathlib.Path]:
-    """查找最新的匹配CSV文件"""
-    files = list(directory.glob(pattern))
-    if not files:
-        return None
-    return max(files, key=lambda p: p.stat().st_mtime)
+
+# 结果文件匹配规则（键 -> 文件名通配）
+RESULT_PATTERNS = {
+    # 优先使用 results.csv
+    "results": "results.csv",
+    # Kingbase 标准命名：<Component>_kbbench_results_*.csv（例如：KingbaseES_kbbench_results_2025...）
+    "kbbench": "*_kbbench_results_*.csv",
+    # 兼容早期或自定义命名：包含 kbbench 的 CSV
+    "kbbench_loose": "*kbbench*.csv",
+    # 标准命名：<Component>_perftest_summary_*.csv（例如：RabbitMQ_perftest_summary_2025...）
+    "mq": "*perftest_summary_*.csv",
+    "normalized": "normalized_all_*.csv",
+}
+
+# 统计摘要涉及的指标列及所需统计量（只计算摘要实际输出的部分）
+DB_SUMMARY_AGGS = {
+    'tps_per_core': ['mean', 'max', 'min', 'median'],
+    'tps_per_gb_memory': ['mean', 'max'],
+    'latency_per_tx_ms': ['mean', 'min'],
+    'cpu_utilization_pct': ['mean'],
+}
+MQ_SUMMARY_AGGS = {
+    'msg_per_sec_per_core': ['mean', 'max', 'min'],
+    'msg_per_sec_per_gb_memory': ['mean', 'max'],
+    'worst_p95_ms': ['mean', 'min'],
+    'throughput_mbps': ['mean', 'max'],
+    'loss_ratio': ['mean'],
+}
+SUMMARY_AGGS = {**DB_SUMMARY_AGGS, **MQ_SUMMARY_AGGS}
+
+# 低基数字符串列，使用 category 存储
+CATEGORY_COLS = ['component', 'component_type']
+
+
+def _scan_latest(data_path: pathlib.Path, patterns: Dict[str, str]) -> Dict[str, Optional[pathlib.Path]]:
+    """
+    单次遍历目录，返回每个通配规则下最新（mtime 最大）的文件
+
+    Args:
+        data_path: 待扫描目录
+        patterns: 键 -> 文件名通配
+
+    Returns:
+        键 -> 最新匹配文件路径（无匹配或目录不存在时为 None）
+    """
+    latest: Dict[str, Optional[pathlib.Path]] = {key: None for key in patterns}
+    latest_mtime: Dict[str, float] = {}
+    try:
+        with os.scandir(str(data_path)) as it:
+            for entry in it:
+                mtime = None
+                for key, pat in patterns.items():
+                    if not fnmatch.fnmatchcase(entry.name, pat):
+                        continue
+                    if mtime is None:
+                        mtime = entry.stat().st_mtime
+                    if key not in latest_mtime or mtime > latest_mtime[key]:
+                        latest_mtime[key] = mtime
+                        latest[key] = data_path / entry.name
+    except FileNotFoundError:
+        pass
+    return latest
+
+
+@functools.lru_cache(maxsize=None)
+def _pyarrow():
+    """按需导入 pyarrow（可选依赖），缺失时返回 (None, None) 以回退到 pandas"""
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except ImportError:
+        return None, None
+    return pa, pacsv
+
+
+def _read_csv(path, dtype: Optional[Dict[str, str]] = None) -> "pd.DataFrame":
+    """
+    读取CSV：表结构已知时直接指定 dtype 跳过类型推断；
+    否则优先使用 pyarrow 引擎（未安装 pyarrow 时回退到默认引擎）
+    """
+    import pandas as pd
+
+    if dtype is not None:
+        return pd.read_csv(path, dtype=dtype, engine='c')
+    try:
+        return pd.read_csv(path, engine='pyarrow', dtype_backend='pyarrow')
+    except ImportError:
+        return pd.read_csv(path)
+
+
+@functools.lru_cache(maxsize=4)
+def _read_normalized(path: str, mtime: float) -> "pd.DataFrame":
+    """
+    按 (路径, mtime) 缓存归一化结果的读取：同一文件连续做 DB/MQ 外推时只解析一次。
+    返回的 DataFrame 为共享对象，调用方不得原地修改。
+    """
+    return _read_csv(path)
+
+
+def _as_categories(df: "pd.DataFrame") -> "pd.DataFrame":
+    """将组件名/组件类型列转为 category，后续 groupby 按整数编码分组"""
+    for col in CATEGORY_COLS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+
+def _to_arrow(df: "pd.DataFrame"):
+    """pyarrow 可用时转为 Arrow 表，否则原样返回 DataFrame"""
+    pa, _ = _pyarrow()
+    return pa.Table.from_pandas(df, preserve_index=False) if pa is not None else df
 
 
 def batch_process(
@@ -36,6 +146,10 @@ def batch_process(
         memory_gb: 测试环境内存大小GB
         output_dir: 输出目录
     """
+    import pandas as pd
+    from normalize_metrics import NormalizedMetrics, DB_DTYPES, MQ_DTYPES, concat_tables, write_csv
+
+    pa, _ = _pyarrow()
     data_path = pathlib.Path(data_dir)
     output_path = pathlib.Path(output_dir)
     output_path.mkdir(exist_ok=True)
@@ -47,20 +161,17 @@ def batch_process(
     
     print("=== 开始批量处理测试结果 ===\n")
     
+    # 单次扫描目录，定位各类最新结果文件
+    latest = _scan_latest(data_path, RESULT_PATTERNS)
+    
     # 查找数据库测试结果
     # 优先查找 results.csv；否则匹配常见命名：*_kbbench_results_*.csv 或包含 kbbench 的文件
-    db_csv = data_path / "results.csv"
-    if not db_csv.exists():
-        # Kingbase 标准命名：<Component>_kbbench_results_*.csv（例如：KingbaseES_kbbench_results_2025...）
-        db_csv = find_latest_csv(data_path, "*_kbbench_results_*.csv")
-    if db_csv is None:
-        # 兼容早期或自定义命名：包含 kbbench 的 CSV
-        db_csv = find_latest_csv(data_path, "*kbbench*.csv")
+    db_csv = latest["results"] or latest["kbbench"] or latest["kbbench_loose"]
     
     if db_csv and db_csv.exists():
         print(f"处理数据库测试结果: {db_csv}")
         try:
-            db_df = pd.read_csv(db_csv)
+            db_df = _read_csv(db_csv, DB_DTYPES)
             # 从文件名猜测组件名（若包含前缀），否则使用 KingbaseES
             comp_name = "KingbaseES"
             name = db_csv.name
@@ -70,15 +181,20 @@ def batch_process(
             db_normalized = normalizer.normalize_db_metrics(db_df, comp_name)
             
             if len(db_normalized) > 0:
-                all_normalized.append(db_normalized)
+                db_data = _to_arrow(db_normalized)
+                all_normalized.append(db_data)
                 output_file = output_path / f"normalized_db_{comp_name}_{timestamp}.csv"
-                db_normalized.to_csv(output_file, index=False, encoding='utf-8')
+                write_csv(db_data, output_file)
                 print(f"  ✓ 已保存: {output_file}")
                 print(f"  ✓ 记录数: {len(db_normalized)}")
                 
-                # 显示最佳性能数据
-                best = db_normalized.loc[db_normalized['tps_per_core'].idxmax()]
-                print(f"  ✓ 最佳TPS/核心: {best['tps_per_core']:.2f} (TPS={best['tps']:.2f}, 并发={best['clients']})")
+                # 显示最佳性能数据（按位置取标量，避免构造整行 Series）
+                cols = db_normalized.columns
+                i = db_normalized['tps_per_core'].to_numpy().argmax()
+                best_tps_per_core = db_normalized.iat[i, cols.get_loc('tps_per_core')]
+                best_tps = db_normalized.iat[i, cols.get_loc('tps')]
+                best_clients = db_normalized.iat[i, cols.get_loc('clients')]
+                print(f"  ✓ 最佳TPS/核心: {best_tps_per_core:.2f} (TPS={best_tps:.2f}, 并发={best_clients})")
             else:
                 print(f"  ⚠ 未找到有效数据")
         except Exception as e:
@@ -89,12 +205,11 @@ def batch_process(
     print()
     
     # 查找消息队列测试结果（允许组件名前缀）
-    # 标准命名：<Component>_perftest_summary_*.csv（例如：RabbitMQ_perftest_summary_2025...）
-    mq_csv = find_latest_csv(data_path, "*perftest_summary_*.csv")
+    mq_csv = latest["mq"]
     if mq_csv and mq_csv.exists():
         print(f"处理消息队列测试结果: {mq_csv}")
         try:
-            mq_df = pd.read_csv(mq_csv)
+            mq_df = _read_csv(mq_csv, MQ_DTYPES)
             # 从 perftest_summary 推断组件名：{Component}_perftest_summary_*.csv
             comp_name = "RabbitMQ"
             name = mq_csv.name
@@ -103,16 +218,20 @@ def batch_process(
             mq_normalized = normalizer.normalize_mq_metrics(mq_df, comp_name)
             
             if len(mq_normalized) > 0:
-                all_normalized.append(mq_normalized)
+                mq_data = _to_arrow(mq_normalized)
+                all_normalized.append(mq_data)
                 output_file = output_path / f"normalized_mq_{comp_name}_{timestamp}.csv"
-                mq_normalized.to_csv(output_file, index=False, encoding='utf-8')
+                write_csv(mq_data, output_file)
                 print(f"  ✓ 已保存: {output_file}")
                 print(f"  ✓ 记录数: {len(mq_normalized)}")
                 
                 # 显示最佳性能数据
-                best = mq_normalized.loc[mq_normalized['msg_per_sec_per_core'].idxmax()]
-                print(f"  ✓ 最佳消息/秒/核心: {best['msg_per_sec_per_core']:.2f} "
-                      f"(消息/秒={best['avg_received_msg_s']:.2f})")
+                cols = mq_normalized.columns
+                i = mq_normalized['msg_per_sec_per_core'].to_numpy().argmax()
+                best_msg_per_core = mq_normalized.iat[i, cols.get_loc('msg_per_sec_per_core')]
+                best_received = mq_normalized.iat[i, cols.get_loc('avg_received_msg_s')]
+                print(f"  ✓ 最佳消息/秒/核心: {best_msg_per_core:.2f} "
+                      f"(消息/秒={best_received:.2f})")
             else:
                 print(f"  ⚠ 未找到有效数据")
         except Exception as e:
@@ -123,59 +242,73 @@ def batch_process(
     # 合并所有归一化结果
     if all_normalized:
         print("\n=== 生成合并归一化指标 ===")
-        combined = pd.concat(all_normalized, ignore_index=True)
         combined_file = output_path / f"normalized_all_{timestamp}.csv"
-        combined.to_csv(combined_file, index=False, encoding='utf-8')
+        if pa is not None:
+            # Arrow 按列拼接（兼容列零拷贝），先写 CSV，再一次性转换为 pandas（self_destruct 后表不可再用）
+            combined_tbl = concat_tables(all_normalized)
+            write_csv(combined_tbl, combined_file)
+            combined = combined_tbl.to_pandas(split_blocks=True, self_destruct=True)
+            del combined_tbl
+        else:
+            combined = pd.concat(all_normalized, ignore_index=True)
+            write_csv(combined, combined_file)
+        # 各帧的类别集合不同，合并后需重新转为 category
+        combined = _as_categories(combined)
         print(f"✓ 合并文件: {combined_file}")
         print(f"✓ 总计记录: {len(combined)}")
         
-        # 生成统计摘要
+        # 生成统计摘要：一次 groupby 聚合得到全部统计量
         print("\n=== 归一化指标统计摘要 ===")
-        for comp_type in combined['component_type'].unique():
-            comp_data = combined[combined['component_type'] == comp_type]
-            comp_name = comp_data['component'].iloc[0]
+        agg_map = {c: funcs for c, funcs in SUMMARY_AGGS.items() if c in combined.columns}
+        groups = combined.groupby('component_type', sort=False, observed=True)
+        stats = groups.agg(agg_map)
+        out = []
+        for comp_type, comp_data in groups:
+            comp_stats = stats.loc[comp_type]
+            comp_name = comp_data['component'].iat[0]
             
-            print(f"\n【{comp_name} ({comp_type})】")
-            print("-" * 50)
+            out.append(f"\n【{comp_name} ({comp_type})】")
+            out.append("-" * 50)
             
             if comp_type == 'DB':
-                print(f"单位核心吞吐 (TPS/核心):")
-                print(f"  平均: {comp_data['tps_per_core'].mean():.2f}")
-                print(f"  最大: {comp_data['tps_per_core'].max():.2f}")
-                print(f"  最小: {comp_data['tps_per_core'].min():.2f}")
-                print(f"  中位数: {comp_data['tps_per_core'].median():.2f}")
+                out.append(f"单位核心吞吐 (TPS/核心):")
+                out.append(f"  平均: {comp_stats[('tps_per_core', 'mean')]:.2f}")
+                out.append(f"  最大: {comp_stats[('tps_per_core', 'max')]:.2f}")
+                out.append(f"  最小: {comp_stats[('tps_per_core', 'min')]:.2f}")
+                out.append(f"  中位数: {comp_stats[('tps_per_core', 'median')]:.2f}")
                 
-                print(f"\n单位内存吞吐 (TPS/GB):")
-                print(f"  平均: {comp_data['tps_per_gb_memory'].mean():.2f}")
-                print(f"  最大: {comp_data['tps_per_gb_memory'].max():.2f}")
+                out.append(f"\n单位内存吞吐 (TPS/GB):")
+                out.append(f"  平均: {comp_stats[('tps_per_gb_memory', 'mean')]:.2f}")
+                out.append(f"  最大: {comp_stats[('tps_per_gb_memory', 'max')]:.2f}")
                 
-                print(f"\n单位事务延迟:")
-                print(f"  平均: {comp_data['latency_per_tx_ms'].mean():.2f} ms")
-                print(f"  最小: {comp_data['latency_per_tx_ms'].min():.2f} ms")
+                out.append(f"\n单位事务延迟:")
+                out.append(f"  平均: {comp_stats[('latency_per_tx_ms', 'mean')]:.2f} ms")
+                out.append(f"  最小: {comp_stats[('latency_per_tx_ms', 'min')]:.2f} ms")
                 
-                print(f"\n资源利用率估算:")
-                print(f"  CPU利用率: 平均 {comp_data['cpu_utilization_pct'].mean():.2f}%")
+                out.append(f"\n资源利用率估算:")
+                out.append(f"  CPU利用率: 平均 {comp_stats[('cpu_utilization_pct', 'mean')]:.2f}%")
             
             elif comp_type == 'MQ':
-                print(f"单位核心吞吐 (消息/秒/核心):")
-                print(f"  平均: {comp_data['msg_per_sec_per_core'].mean():.2f}")
-                print(f"  最大: {comp_data['msg_per_sec_per_core'].max():.2f}")
-                print(f"  最小: {comp_data['msg_per_sec_per_core'].min():.2f}")
+                out.append(f"单位核心吞吐 (消息/秒/核心):")
+                out.append(f"  平均: {comp_stats[('msg_per_sec_per_core', 'mean')]:.2f}")
+                out.append(f"  最大: {comp_stats[('msg_per_sec_per_core', 'max')]:.2f}")
+                out.append(f"  最小: {comp_stats[('msg_per_sec_per_core', 'min')]:.2f}")
                 
-                print(f"\n单位内存吞吐 (消息/秒/GB):")
-                print(f"  平均: {comp_data['msg_per_sec_per_gb_memory'].mean():.2f}")
-                print(f"  最大: {comp_data['msg_per_sec_per_gb_memory'].max():.2f}")
+                out.append(f"\n单位内存吞吐 (消息/秒/GB):")
+                out.append(f"  平均: {comp_stats[('msg_per_sec_per_gb_memory', 'mean')]:.2f}")
+                out.append(f"  最大: {comp_stats[('msg_per_sec_per_gb_memory', 'max')]:.2f}")
                 
-                print(f"\n延迟指标:")
-                print(f"  P95延迟: 平均 {comp_data['worst_p95_ms'].mean():.2f} ms")
-                print(f"  P95延迟: 最小 {comp_data['worst_p95_ms'].min():.2f} ms")
+                out.append(f"\n延迟指标:")
+                out.append(f"  P95延迟: 平均 {comp_stats[('worst_p95_ms', 'mean')]:.2f} ms")
+                out.append(f"  P95延迟: 最小 {comp_stats[('worst_p95_ms', 'min')]:.2f} ms")
                 
-                print(f"\n吞吐带宽:")
-                print(f"  平均: {comp_data['throughput_mbps'].mean():.2f} MB/s")
-                print(f"  最大: {comp_data['throughput_mbps'].max():.2f} MB/s")
+                out.append(f"\n吞吐带宽:")
+                out.append(f"  平均: {comp_stats[('throughput_mbps', 'mean')]:.2f} MB/s")
+                out.append(f"  最大: {comp_stats[('throughput_mbps', 'max')]:.2f} MB/s")
                 
-                print(f"\n消息丢失率:")
-                print(f"  平均: {comp_data['loss_ratio'].mean():.4f}")
+                out.append(f"\n消息丢失率:")
+                out.append(f"  平均: {comp_stats[('loss_ratio', 'mean')]:.4f}")
+        sys.stdout.write("\n".join(out) + "\n")
         
         print("\n" + "=" * 60)
         print("归一化建模完成！指标已保存，可用于容量外推计算。")
@@ -196,12 +329,13 @@ def capacity_extrapolation_example(
         target_slo: 目标SLO约束
         output_dir: 输出目录
     """
+    from normalize_metrics import NormalizedMetrics, write_csv
+
     print("=== 容量外推计算 ===")
     
-    df = pd.read_csv(normalized_file)
-    normalizer = NormalizedMetrics()
+    df = _read_normalized(str(normalized_file), os.stat(normalized_file).st_mtime)
     
-    recommendations = normalizer.generate_capacity_extrapolation(df, target_slo)
+    recommendations = NormalizedMetrics.generate_capacity_extrapolation(df, target_slo)
     
     if len(recommendations) > 0:
         output_path = pathlib.Path(output_dir)
@@ -209,7 +343,7 @@ def capacity_extrapolation_example(
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_file = output_path / f"capacity_recommendation_{timestamp}.csv"
-        recommendations.to_csv(output_file, index=False, encoding='utf-8')
+        write_csv(recommendations, output_file)
         
         print(f"\n✓ 资源配置建议已保存: {output_file}\n")
         print(recommendations.to_string(index=False))
@@ -279,11 +413,11 @@ def main():
     
     # 容量外推示例
     if args.extrapolate:
-        normalized_file = pathlib.Path(args.output_dir) / "normalized_all_*.csv"
-        files = list(pathlib.Path(args.output_dir).glob("normalized_all_*.csv"))
-        if files:
-            latest_file = max(files, key=lambda p: p.stat().st_mtime)
-            
+        latest_file = _scan_latest(
+            pathlib.Path(args.output_dir),
+            {"normalized": RESULT_PATTERNS["normalized"]},
+        )["normalized"]
+        if latest_file:
             if args.target_tps:
                 target_slo = {
                     'component_type': 'DB',
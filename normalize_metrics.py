@@ -11,11 +11,216 @@
 import pandas as pd
 import numpy as np
 import argparse
+import csv
+import functools
 import pathlib
 from typing import Dict, List, Optional, Tuple
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # pyarrow 为可选依赖，缺失时回退到 DataFrame.to_csv
+    pa = None
+
+
+# 原始测试结果的列类型（表结构由 test_kingbase.py / test_rabbitmq.py 固定），读取时可跳过类型推断
+DB_DTYPES = {
+    'timestamp': 'str',
+    'clients': 'int32',
+    'jobs': 'int32',
+    'duration_s': 'int32',
+    'tps_including': 'float64',
+    'tps_excluding': 'float64',
+    'latency_ms_avg': 'float64',
+    'tx_processed': 'Int64',  # 失败的运行没有该值，使用可空整型
+    'return_code': 'int32',
+    'error': 'str',
+}
+MQ_DTYPES = {
+    'run_id': 'str',
+    'target_rate_msg_s': 'int64',
+    'avg_sent_msg_s': 'int64',
+    'avg_received_msg_s': 'int64',
+    'worst_p95_ms': 'int64',
+    'success': 'bool',
+    'note': 'str',
+    'duration_s': 'int32',
+    'producers': 'int32',
+    'consumers': 'int32',
+    'size_bytes': 'int64',
+    'queue': 'str',
+}
+
+# 归一化实际用到的输入列（读取时只解析这些列）
+DB_COLS = ['timestamp', 'clients', 'jobs', 'duration_s', 'tps_excluding', 'latency_ms_avg', 'tx_processed', 'return_code']
+MQ_COLS = [
+    'run_id', 'target_rate_msg_s', 'avg_sent_msg_s', 'avg_received_msg_s', 'worst_p95_ms',
+    'success', 'duration_s', 'producers', 'consumers', 'size_bytes',
+]
+
+# 命令行统计摘要所需的统计量（groupby 一次聚合）
+SUMMARY_AGGS = {
+    'component': ['first'],
+    'tps_per_core': ['mean', 'max'],
+    'tps_per_gb_memory': ['mean', 'max'],
+    'latency_per_tx_ms': ['mean'],
+    'msg_per_sec_per_core': ['mean', 'max'],
+    'msg_per_sec_per_gb_memory': ['mean', 'max'],
+    'worst_p95_ms': ['mean'],
+}
+
+
+
+def write_csv(data, path) -> None:
+    """
+    写出 CSV（UTF-8）：优先使用 pyarrow.csv.write_csv 在 C++ 中按列序列化，
+    未安装 pyarrow 时回退到 DataFrame.to_csv
+
+    Args:
+        data: DataFrame 或 pyarrow.Table
+        path: 输出文件路径
+    """
+    if pa is None:
+        data.to_csv(path, index=False, encoding='utf-8')
+        return
+    if not isinstance(data, pa.Table):
+        data = pa.Table.from_pandas(data, preserve_index=False)
+    pacsv.write_csv(data, str(path), write_options=pacsv.WriteOptions(include_header=True))
+
+
+def write_outputs(frames: Dict[str, pd.DataFrame], output_dir, timestamp: str) -> Dict[str, pathlib.Path]:
+    """
+    将 normalize_all 的结果写为 normalized_<键>_<timestamp>.csv；
+    各文件互不相关，在线程池中并行写出（pyarrow 写 CSV 时释放 GIL）
+
+    Args:
+        frames: 键 -> 归一化结果 DataFrame 或 pyarrow.Table（键形如 db_KingbaseES / mq_RabbitMQ / all）
+        output_dir: 输出目录（需已存在）
+        timestamp: 文件名中的时间戳
+
+    Returns:
+        键 -> 输出文件路径
+    """
+    output_dir = pathlib.Path(output_dir)
+    suffix = f"_{timestamp}.csv"
+    paths = {key: output_dir / f"normalized_{key}{suffix}" for key in frames}
+    if not paths:
+        return paths
+    with ThreadPoolExecutor(max_workers=len(paths)) as ex:
+        futures = [ex.submit(write_csv, frames[key], path) for key, path in paths.items()]
+        for fut in as_completed(futures):
+            fut.result()  # 任一写出失败时在此抛出
+    return paths
+
+
+def concat_tables(tables: list):
+    """
+    按列名合并多个结果（缺失列补空值，同名列的整型/浮点宽度不一致时自动提升）：
+    pyarrow 可用时在 Arrow 中按列拼接，不经过 pandas 块管理器重建；否则回退到 pd.concat
+
+    Args:
+        tables: pyarrow.Table 或 DataFrame 列表
+
+    Returns:
+        pyarrow.Table（未安装 pyarrow 时为 DataFrame）
+    """
+    if pa is None:
+        return pd.concat(tables, ignore_index=True)
+    tables = [t if isinstance(t, pa.Table) else pa.Table.from_pandas(t, preserve_index=False) for t in tables]
+    try:
+        return pa.concat_tables(tables, promote_options="permissive")
+    except pa.ArrowTypeError:
+        raise
+    except TypeError:  # pyarrow < 14 不支持 promote_options
+        return pa.concat_tables(tables, promote=True)
+
+
+def read_columns(path, columns: List[str], dtypes: Dict[str, str]) -> pd.DataFrame:
+    """
+    只读取指定列：优先用 pyarrow.csv 在解析阶段完成列裁剪（Arrow 列直接作为 pandas ArrowDtype 列），
+    未安装 pyarrow 时回退到 pandas usecols
+    文件中不存在的列不报错、也不补出全空列，由 _column 的缺省值兜底（与逐行 row.get 的语义一致）
+
+    Args:
+        path: CSV 文件路径
+        columns: 需要读取的列
+        dtypes: 列类型表（DB_DTYPES / MQ_DTYPES），其中 'str' 列按字符串读取，避免被推断为时间戳
+    """
+    if pa is None:
+        wanted = set(columns)
+        return pd.read_csv(path, usecols=lambda c: c in wanted, dtype={c: dtypes[c] for c in columns if c in dtypes})
+    convert_options = pacsv.ConvertOptions(
+        include_columns=columns,
+        include_missing_columns=True,
+        column_types={c: pa.string() for c in columns if dtypes.get(c) == 'str'},
+    )
+    table = pacsv.read_csv(str(path), convert_options=convert_options)
+    # include_missing_columns 会把缺失列补成全空列；按表头去掉，让 _column 的缺省值生效
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        header = set(next(csv.reader(f), []))
+    table = table.select([c for c in columns if c in header])
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def _best_row_index(df: pd.DataFrame, component_type: str, value_col: str, constraint_col: str, limit) -> int:
+    """在 df 中找出指定组件类型、满足 constraint_col <= limit 的行里 value_col 最大的行位置，无则返回 -1"""
+    eligible = df['component_type'].eq(component_type).to_numpy(dtype=bool, na_value=False)
+    values = df[value_col].to_numpy(dtype=np.float64, na_value=np.nan)
+    constraint = df[constraint_col].to_numpy(dtype=np.float64, na_value=np.nan)
+    # 并列取首个
+    candidates = np.flatnonzero(eligible & (constraint <= float(limit)))
+    if candidates.size == 0:
+        return -1
+    return int(candidates[values[candidates].argmax()])
+
+
+def _column(df: pd.DataFrame, name: str, default) -> pd.Series:
+    """取列；缺失时返回以 default 填充的同索引 Series（对应逐行 row.get(name, default) 的语义）"""
+    if name in df.columns:
+        return df[name]
+    return pd.Series(default, index=df.index)
+
+
+BYTES_PER_MB = 1 << 20
+BYTES_PER_GB = 1 << 30
+
+# 经验假设：单核理论最大 TPS / 消息吞吐，用于估算 CPU 利用率
+MAX_TPS_PER_CORE = 500
+MAX_MSG_PER_SEC_PER_CORE = 10000
+
+# 派生指标的保留位数（组装完成后整列一次性舍入）
+DB_ROUND2_COLS = [
+    'tps_per_core', 'latency_ms_per_core', 'tps_per_client', 'tps_per_job',
+    'tps_per_gb_memory', 'latency_per_tx_ms', 'memory_per_tx_bytes', 'cpu_utilization_pct',
+]
+MQ_ROUND2_COLS = [
+    'msg_per_sec_per_core', 'msg_per_sec_per_producer', 'msg_per_sec_per_consumer',
+    'msg_per_sec_per_gb_memory', 'msg_per_sec_per_kb', 'latency_per_msg_ms',
+    'memory_per_msg_bytes', 'throughput_mbps', 'cpu_utilization_pct',
+]
+MQ_ROUND4_COLS = ['loss_ratio']
+
+# 归一化结果的紧凑存储：有界列（百分比、比例）降为 float32，计数列降为 int32，组件名/类型为 category
+# （吞吐/速率类列量级可达 1e7 以上，float32 仅约 7 位有效数字，汇总求和会漂移，保持 float64）
+DB_FLOAT32_COLS = ['cpu_utilization_pct']
+DB_INT32_COLS = ['clients', 'jobs', 'duration_s', 'test_cpu_cores']
+MQ_FLOAT32_COLS = ['cpu_utilization_pct', 'loss_ratio']
+MQ_INT32_COLS = [
+    'target_rate_msg_s', 'duration_s', 'avg_sent_msg_s', 'avg_received_msg_s', 'worst_p95_ms',
+    'producers', 'consumers', 'size_bytes', 'latency_per_msg_ms', 'test_cpu_cores',
+]
+
+
+def _compact(df: pd.DataFrame, float32_cols: List[str], int32_cols: List[str]) -> pd.DataFrame:
+    """按上面的列清单降低存储宽度；计数列仅在为无空值整型时转换"""
+    dtypes = {'component': 'category', 'component_type': 'category'}
+    dtypes.update({c: 'float32' for c in float32_cols})
+    dtypes.update({c: 'int32' for c in int32_cols if pd.api.types.is_integer_dtype(df[c])})
+    return df.astype(dtypes)
+
 
 class NormalizedMetrics:
     """归一化指标计算器"""
@@ -30,7 +235,14 @@ class NormalizedMetrics:
         """
         self.cpu_cores = cpu_cores
         self.memory_gb = memory_gb
-        self.memory_bytes = memory_gb * 1024 * 1024 * 1024
+        self.memory_bytes = memory_gb * BYTES_PER_GB
+        
+        # 各行共用的不变量，构造时计算一次
+        # 单位事务内存占用 = 内存的 30% / (TPS * 60)，分子部分与行无关
+        self._mem_budget_per_tps_sec = self.memory_bytes * 0.3 / 60.0
+        # CPU 利用率估算的理论最大吞吐（保持“先除后乘 100”的运算顺序，结果与逐项计算一致）
+        self._max_tps = cpu_cores * MAX_TPS_PER_CORE
+        self._max_msg_per_sec = cpu_cores * MAX_MSG_PER_SEC_PER_CORE
     
     def normalize_db_metrics(self, df: pd.DataFrame, component_name: str = "KingbaseES") -> pd.DataFrame:
         """
@@ -43,82 +255,86 @@ class NormalizedMetrics:
         Returns:
             包含归一化指标的DataFrame
         """
-        results = []
+        # 过滤：仅保留成功（return_code == 0）且 TPS 有效的运行
+        # 掩码直接在 NumPy 布尔数组上组合；可空列（ArrowDtype / Int64）的 NA 一律视为不满足
+        tps_all = _column(df, 'tps_excluding', np.nan)
+        mask = (
+            _column(df, 'return_code', 1).eq(0).to_numpy(dtype=bool, na_value=False)
+            & tps_all.notna().to_numpy()
+            & tps_all.gt(0).to_numpy(dtype=bool, na_value=False)
+        )
+        sub = df.loc[mask]
         
-        for _, row in df.iterrows():
-            if pd.isna(row.get('tps_excluding')) or row.get('return_code', 1) != 0:
-                continue
-            
-            clients = row.get('clients', 0)
-            jobs = row.get('jobs', 0)
-            tps = row.get('tps_excluding', 0)
-            latency_ms = row.get('latency_ms_avg', 0)
-            
-            if tps <= 0:
-                continue
-            
-            # 单位核心吞吐（TPS/核心）
-            tps_per_core = tps / self.cpu_cores
-            
-            # 单位客户端吞吐（TPS/客户端）
-            tps_per_client = tps / clients if clients > 0 else 0
-            
-            # 单位线程吞吐（TPS/线程）
-            tps_per_job = tps / jobs if jobs > 0 else 0
-            
-            # 单位事务延迟（ms/事务）
-            latency_per_tx = latency_ms
-            
-            # 单位核心延迟（假设延迟与核心数相关）
-            latency_per_core = latency_ms  # 延迟通常与核心数无关，但保留字段
-            
-            # 吞吐密度（TPS/GB内存）
-            tps_per_gb = tps / self.memory_gb
-            
-            # 估算单位事务内存占用（假设内存占用与TPS相关）
-            # 基于经验值：每个连接约2MB，加上缓存等
-            estimated_mem_per_tx = (self.memory_bytes * 0.3) / (tps * 60) if tps > 0 else 0
-            
-            # 资源利用率估算（基于TPS和并发数）
-            # CPU利用率 = (实际TPS / 理论最大TPS) * 100，理论值基于经验
-            estimated_max_tps = self.cpu_cores * 500  # 假设每核心最大500 TPS
-            cpu_utilization = min(100, (tps / estimated_max_tps) * 100) if estimated_max_tps > 0 else 0
-            
-            results.append({
-                'component': component_name,
-                'component_type': 'DB',
-                'timestamp': row.get('timestamp', ''),
-                'clients': clients,
-                'jobs': jobs,
-                'duration_s': row.get('duration_s', 0),
-                
-                # 原始指标
-                'tps': tps,
-                'latency_ms': latency_ms,
-                'tx_processed': row.get('tx_processed', 0),
-                
-                # 归一化指标（单位核心）
-                'tps_per_core': round(tps_per_core, 2),
-                'latency_ms_per_core': round(latency_per_core, 2),
-                
-                # 归一化指标（单位资源）
-                'tps_per_client': round(tps_per_client, 2),
-                'tps_per_job': round(tps_per_job, 2),
-                'tps_per_gb_memory': round(tps_per_gb, 2),
-                
-                # 单位事务开销
-                'latency_per_tx_ms': round(latency_per_tx, 2),
-                'memory_per_tx_bytes': round(estimated_mem_per_tx, 2),
-                
-                # 资源利用率
-                'cpu_utilization_pct': round(cpu_utilization, 2),
-                
-                # 测试环境
-                'test_cpu_cores': self.cpu_cores,
-                'test_memory_gb': self.memory_gb,
-            })
+        clients = _column(sub, 'clients', 0)
+        jobs = _column(sub, 'jobs', 0)
+        tps = tps_all.loc[mask]
+        latency_ms = _column(sub, 'latency_ms_avg', 0)
+        
+        # 单位核心吞吐（TPS/核心）
+        tps_per_core = tps / self.cpu_cores
+        
+        # 单位客户端吞吐（TPS/客户端）
+        tps_per_client = np.where(clients > 0, tps / clients, 0)
         
-        return pd.DataFrame(results)
+        # 单位线程吞吐（TPS/线程）
+        tps_per_job = np.where(jobs > 0, tps / jobs, 0)
+        
+        # 单位事务延迟（ms/事务）
+        latency_per_tx = latency_ms
+        
+        # 单位核心延迟（假设延迟与核心数相关）
+        latency_per_core = latency_ms  # 延迟通常与核心数无关，但保留字段
+        
+        # 吞吐密度（TPS/GB内存）
+        tps_per_gb = tps / self.memory_gb
+        
+        # 估算单位事务内存占用（假设内存占用与TPS相关）
+        # 基于经验值：每个连接约2MB，加上缓存等；已过滤 tps > 0
+        estimated_mem_per_tx = self._mem_budget_per_tps_sec / tps
+        
+        # 资源利用率估算（基于TPS和并发数）
+        # CPU利用率 = (实际TPS / 理论最大TPS) * 100，理论值基于经验（每核心 MAX_TPS_PER_CORE）
+        if self._max_tps > 0:
+            cpu_utilization = np.minimum(100, (tps / self._max_tps) * 100)
+        else:
+            cpu_utilization = 0
+        
+        results = pd.DataFrame({
+            'component': component_name,
+            'component_type': 'DB',
+            'timestamp': _column(sub, 'timestamp', ''),
+            'clients': clients,
+            'jobs': jobs,
+            'duration_s': _column(sub, 'duration_s', 0),
+            
+            # 原始指标
+            'tps': tps,
+            'latency_ms': latency_ms,
+            'tx_processed': _column(sub, 'tx_processed', 0),
+            
+            # 归一化指标（单位核心）
+            'tps_per_core': tps_per_core,
+            'latency_ms_per_core': latency_per_core,
+            
+            # 归一化指标（单位资源）
+            'tps_per_client': tps_per_client,
+            'tps_per_job': tps_per_job,
+            'tps_per_gb_memory': tps_per_gb,
+            
+            # 单位事务开销
+            'latency_per_tx_ms': latency_per_tx,
+            'memory_per_tx_bytes': estimated_mem_per_tx,
+            
+            # 资源利用率
+            'cpu_utilization_pct': cpu_utilization,
+            
+            # 测试环境
+            'test_cpu_cores': self.cpu_cores,
+            'test_memory_gb': self.memory_gb,
+        }, index=sub.index)
+        
+        results[DB_ROUND2_COLS] = results[DB_ROUND2_COLS].round(2)
+        return _compact(results.reset_index(drop=True), DB_FLOAT32_COLS, DB_INT32_COLS)
     
     def normalize_mq_metrics(self, summary_df: pd.DataFrame, component_name: str = "RabbitMQ") -> pd.DataFrame:
         """
@@ -131,97 +347,226 @@ class NormalizedMetrics:
         Returns:
             包含归一化指标的DataFrame
         """
-        results = []
+        # 过滤：仅保留判定成功且有接收量的试验
+        mask = (
+            _column(summary_df, 'success', False).to_numpy(dtype=bool, na_value=False)
+            & _column(summary_df, 'avg_received_msg_s', 0).gt(0).to_numpy(dtype=bool, na_value=False)
+        )
+        sub = summary_df.loc[mask]
         
-        for _, row in summary_df.iterrows():
-            if not row.get('success', False) or row.get('avg_received_msg_s', 0) <= 0:
-                continue
-            
-            target_rate = row.get('target_rate_msg_s', 0)
-            avg_sent = row.get('avg_sent_msg_s', 0)
-            avg_received = row.get('avg_received_msg_s', 0)
-            worst_p95 = row.get('worst_p95_ms', 0)
-            producers = row.get('producers', 0)
-            consumers = row.get('consumers', 0)
-            size_bytes = row.get('size_bytes', 0)
-            duration_s = row.get('duration_s', 0)
-            
-            # 单位核心吞吐（msg/s/核心）
-            msg_per_sec_per_core = avg_received / self.cpu_cores
-            
-            # 单位生产者吞吐（msg/s/生产者）
-            msg_per_sec_per_producer = avg_received / producers if producers > 0 else 0
-            
-            # 单位消费者吞吐（msg/s/消费者）
-            msg_per_sec_per_consumer = avg_received / consumers if consumers > 0 else 0
-            
-            # 单位消息延迟（ms/消息）
-            latency_per_msg = worst_p95
-            
-            # 吞吐密度（msg/s/GB内存）
-            msg_per_sec_per_gb = avg_received / self.memory_gb
-            
-            # 单位消息大小吞吐（msg/s/KB）
-            msg_per_sec_per_kb = avg_received / (size_bytes / 1024) if size_bytes > 0 else 0
-            
-            # 估算单位消息内存占用
-            # 基于消息大小和队列长度估算
-            estimated_mem_per_msg = size_bytes * 1.5  # 消息本身 + 开销
-            
-            # 吞吐带宽（MB/s）
-            throughput_mbps = (avg_received * size_bytes) / (1024 * 1024)
-            
-            # CPU利用率估算
-            # 假设每核心最大处理能力为10000 msg/s
-            estimated_max_msg_per_sec = self.cpu_cores * 10000
-            cpu_utilization = min(100, (avg_received / estimated_max_msg_per_sec) * 100) if estimated_max_msg_per_sec > 0 else 0
+        avg_sent = _column(sub, 'avg_sent_msg_s', 0)
+        avg_received = sub['avg_received_msg_s']
+        worst_p95 = _column(sub, 'worst_p95_ms', 0)
+        producers = _column(sub, 'producers', 0)
+        consumers = _column(sub, 'consumers', 0)
+        size_bytes = _column(sub, 'size_bytes', 0)
+        
+        # 单位核心吞吐（msg/s/核心）
+        msg_per_sec_per_core = avg_received / self.cpu_cores
+        
+        # 单位生产者吞吐（msg/s/生产者）
+        msg_per_sec_per_producer = np.where(producers > 0, avg_received / producers, 0)
+        
+        # 单位消费者吞吐（msg/s/消费者）
+        msg_per_sec_per_consumer = np.where(consumers > 0, avg_received / consumers, 0)
+        
+        # 单位消息延迟（ms/消息）
+        latency_per_msg = worst_p95
+        
+        # 吞吐密度（msg/s/GB内存）
+        msg_per_sec_per_gb = avg_received / self.memory_gb
+        
+        # 单位消息大小吞吐（msg/s/KB）
+        msg_per_sec_per_kb = np.where(size_bytes > 0, avg_received / (size_bytes / 1024), 0)
+        
+        # 估算单位消息内存占用
+        # 基于消息大小和队列长度估算
+        estimated_mem_per_msg = size_bytes * 1.5  # 消息本身 + 开销
+        
+        # 吞吐带宽（MB/s）
+        throughput_mbps = (avg_received * size_bytes) / BYTES_PER_MB
+        
+        # CPU利用率估算
+        # 假设每核心最大处理能力为 MAX_MSG_PER_SEC_PER_CORE msg/s
+        if self._max_msg_per_sec > 0:
+            cpu_utilization = np.minimum(100, (avg_received / self._max_msg_per_sec) * 100)
+        else:
+            cpu_utilization = 0
+        
+        # 消息丢失率
+        loss_ratio = np.where(avg_sent > 0, 1 - avg_received / avg_sent, 0)
+        
+        results = pd.DataFrame({
+            'component': component_name,
+            'component_type': 'MQ',
+            'run_id': _column(sub, 'run_id', ''),
+            'target_rate_msg_s': _column(sub, 'target_rate_msg_s', 0),
+            'duration_s': _column(sub, 'duration_s', 0),
+            
+            # 原始指标
+            'avg_sent_msg_s': avg_sent,
+            'avg_received_msg_s': avg_received,
+            'worst_p95_ms': worst_p95,
+            'producers': producers,
+            'consumers': consumers,
+            'size_bytes': size_bytes,
+            
+            # 归一化指标（单位核心）
+            'msg_per_sec_per_core': msg_per_sec_per_core,
+            
+            # 归一化指标（单位资源）
+            'msg_per_sec_per_producer': msg_per_sec_per_producer,
+            'msg_per_sec_per_consumer': msg_per_sec_per_consumer,
+            'msg_per_sec_per_gb_memory': msg_per_sec_per_gb,
+            'msg_per_sec_per_kb': msg_per_sec_per_kb,
+            
+            # 单位消息开销
+            'latency_per_msg_ms': latency_per_msg,
+            'memory_per_msg_bytes': estimated_mem_per_msg,
+            
+            # 吞吐指标
+            'throughput_mbps': throughput_mbps,
+            
+            # 资源利用率
+            'cpu_utilization_pct': cpu_utilization,
+            'loss_ratio': loss_ratio,
+            
+            # 测试环境
+            'test_cpu_cores': self.cpu_cores,
+            'test_memory_gb': self.memory_gb,
+        }, index=sub.index)
+        
+        results[MQ_ROUND2_COLS] = results[MQ_ROUND2_COLS].round(2)
+        results[MQ_ROUND4_COLS] = results[MQ_ROUND4_COLS].round(4)
+        return _compact(results.reset_index(drop=True), MQ_FLOAT32_COLS, MQ_INT32_COLS)
+    
+    def normalize_db_lazy(self, lf: "pl.LazyFrame", component_name: str = "KingbaseES") -> "pl.LazyFrame":
+        """
+        normalize_db_metrics 的 Polars LazyFrame 版本（--engine polars）：
+        过滤、列运算与舍入组成一个查询，由 Polars 优化器做投影/谓词下推并流式执行
+        
+        Args:
+            lf: 数据库测试结果（例如 pl.scan_csv 的结果）
+            component_name: 组件名称
             
-            # 消息丢失率
-            loss_ratio = 1 - (avg_received / avg_sent) if avg_sent > 0 else 0
+        Returns:
+            列与 normalize_db_metrics 一致的 LazyFrame
+        """
+        pl = _polars()
+        tps = pl.col('tps_excluding')
+        clients = pl.col('clients')
+        jobs = pl.col('jobs')
+        latency_ms = pl.col('latency_ms_avg')
+        if self._max_tps > 0:
+            cpu_utilization = ((tps / self._max_tps) * 100).clip(upper_bound=100)
+        else:
+            cpu_utilization = pl.lit(0.0)
+        return (
+            lf.filter((pl.col('return_code') == 0) & tps.is_not_null() & (tps > 0))
+            .select(
+                pl.lit(component_name).alias('component'),
+                pl.lit('DB').alias('component_type'),
+                pl.col('timestamp'),
+                clients,
+                jobs,
+                pl.col('duration_s'),
+                tps.alias('tps'),
+                latency_ms.alias('latency_ms'),
+                pl.col('tx_processed'),
+                (tps / self.cpu_cores).alias('tps_per_core'),
+                latency_ms.alias('latency_ms_per_core'),
+                pl.when(clients > 0).then(tps / clients).otherwise(0.0).alias('tps_per_client'),
+                pl.when(jobs > 0).then(tps / jobs).otherwise(0.0).alias('tps_per_job'),
+                (tps / self.memory_gb).alias('tps_per_gb_memory'),
+                latency_ms.alias('latency_per_tx_ms'),
+                (self._mem_budget_per_tps_sec / tps).alias('memory_per_tx_bytes'),
+                cpu_utilization.alias('cpu_utilization_pct'),
+                pl.lit(self.cpu_cores).alias('test_cpu_cores'),
+                pl.lit(self.memory_gb).alias('test_memory_gb'),
+            )
+            .with_columns([pl.col(c).round(2) for c in DB_ROUND2_COLS])
+        )
+    
+    def normalize_mq_lazy(self, lf: "pl.LazyFrame", component_name: str = "RabbitMQ") -> "pl.LazyFrame":
+        """
+        normalize_mq_metrics 的 Polars LazyFrame 版本（--engine polars）
+        
+        Args:
+            lf: 消息队列测试汇总（例如 pl.scan_csv 的结果）
+            component_name: 组件名称
             
-            results.append({
-                'component': component_name,
-                'component_type': 'MQ',
-                'run_id': row.get('run_id', ''),
-                'target_rate_msg_s': target_rate,
-                'duration_s': duration_s,
-                
-                # 原始指标
-                'avg_sent_msg_s': avg_sent,
-                'avg_received_msg_s': avg_received,
-                'worst_p95_ms': worst_p95,
-                'producers': producers,
-                'consumers': consumers,
-                'size_bytes': size_bytes,
-                
-                # 归一化指标（单位核心）
-                'msg_per_sec_per_core': round(msg_per_sec_per_core, 2),
-                
-                # 归一化指标（单位资源）
-                'msg_per_sec_per_producer': round(msg_per_sec_per_producer, 2),
-                'msg_per_sec_per_consumer': round(msg_per_sec_per_consumer, 2),
-                'msg_per_sec_per_gb_memory': round(msg_per_sec_per_gb, 2),
-                'msg_per_sec_per_kb': round(msg_per_sec_per_kb, 2),
-                
-                # 单位消息开销
-                'latency_per_msg_ms': round(latency_per_msg, 2),
-                'memory_per_msg_bytes': round(estimated_mem_per_msg, 2),
-                
-                # 吞吐指标
-                'throughput_mbps': round(throughput_mbps, 2),
-                
-                # 资源利用率
-                'cpu_utilization_pct': round(cpu_utilization, 2),
-                'loss_ratio': round(loss_ratio, 4),
-                
-                # 测试环境
-                'test_cpu_cores': self.cpu_cores,
-                'test_memory_gb': self.memory_gb,
-            })
+        Returns:
+            列与 normalize_mq_metrics 一致的 LazyFrame
+        """
+        pl = _polars()
+        avg_sent = pl.col('avg_sent_msg_s')
+        avg_received = pl.col('avg_received_msg_s')
+        producers = pl.col('producers')
+        consumers = pl.col('consumers')
+        size_bytes = pl.col('size_bytes')
+        if self._max_msg_per_sec > 0:
+            cpu_utilization = ((avg_received / self._max_msg_per_sec) * 100).clip(upper_bound=100)
+        else:
+            cpu_utilization = pl.lit(0.0)
+        return (
+            lf.filter(pl.col('success').fill_null(False) & (avg_received > 0))
+            .select(
+                pl.lit(component_name).alias('component'),
+                pl.lit('MQ').alias('component_type'),
+                pl.col('run_id'),
+                pl.col('target_rate_msg_s'),
+                pl.col('duration_s'),
+                avg_sent,
+                avg_received,
+                pl.col('worst_p95_ms'),
+                producers,
+                consumers,
+                size_bytes,
+                (avg_received / self.cpu_cores).alias('msg_per_sec_per_core'),
+                pl.when(producers > 0).then(avg_received / producers).otherwise(0.0).alias('msg_per_sec_per_producer'),
+                pl.when(consumers > 0).then(avg_received / consumers).otherwise(0.0).alias('msg_per_sec_per_consumer'),
+                (avg_received / self.memory_gb).alias('msg_per_sec_per_gb_memory'),
+                pl.when(size_bytes > 0).then(avg_received / (size_bytes / 1024)).otherwise(0.0).alias('msg_per_sec_per_kb'),
+                pl.col('worst_p95_ms').alias('latency_per_msg_ms'),
+                (size_bytes * 1.5).alias('memory_per_msg_bytes'),
+                ((avg_received * size_bytes) / BYTES_PER_MB).alias('throughput_mbps'),
+                cpu_utilization.alias('cpu_utilization_pct'),
+                pl.when(avg_sent > 0).then(1 - avg_received / avg_sent).otherwise(0.0).alias('loss_ratio'),
+                pl.lit(self.cpu_cores).alias('test_cpu_cores'),
+                pl.lit(self.memory_gb).alias('test_memory_gb'),
+            )
+            .with_columns([pl.col(c).round(2) for c in MQ_ROUND2_COLS])
+            .with_columns([pl.col(c).round(4) for c in MQ_ROUND4_COLS])
+        )
+    
+    def normalize_all(
+        self,
+        db_df: Optional[pd.DataFrame] = None,
+        mq_df: Optional[pd.DataFrame] = None,
+        db_component: str = "KingbaseES",
+        mq_component: str = "RabbitMQ",
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        一次归一化 DB / MQ 两类结果，供批量调用方与 write_outputs 配合使用
         
-        return pd.DataFrame(results)
+        Args:
+            db_df: 数据库测试结果（None 表示跳过）
+            mq_df: 消息队列测试汇总（None 表示跳过）
+            db_component: 数据库组件名称
+            mq_component: 消息队列组件名称
+            
+        Returns:
+            键 -> 归一化结果，键为 db_<组件名> / mq_<组件名>
+        """
+        frames = {}
+        if db_df is not None:
+            frames[f"db_{db_component}"] = self.normalize_db_metrics(db_df, db_component)
+        if mq_df is not None:
+            frames[f"mq_{mq_component}"] = self.normalize_mq_metrics(mq_df, mq_component)
+        return frames
     
-    def generate_capacity_extrapolation(self, normalized_df: pd.DataFrame, target_slo: Dict) -> pd.DataFrame:
+    @staticmethod
+    def generate_capacity_extrapolation(normalized_df: pd.DataFrame, target_slo: Dict) -> pd.DataFrame:
         """
         基于SLO反推所需资源
         
@@ -246,16 +591,15 @@ class NormalizedMetrics:
             # 基于TPS需求反推
             target_tps = target_slo.get('target_tps', 0)
             max_latency = target_slo.get('max_latency_ms', 1000)
+            if target_tps <= 0:
+                return pd.DataFrame(recommendations)
             
-            # 找到满足延迟要求的基准数据
-            valid_data = normalized_df[
-                (normalized_df['component_type'] == 'DB') &
-                (normalized_df['latency_ms'] <= max_latency)
-            ]
+            # 在满足延迟要求的基准数据中，使用最佳性能数据（最高TPS/核心）；直接在列数组上选优，不构造过滤后的 DataFrame
+            i = _best_row_index(normalized_df, 'DB', 'tps_per_core', 'latency_ms', max_latency)
             
-            if len(valid_data) > 0:
-                # 使用最佳性能数据（最高TPS/核心）
-                best = valid_data.loc[valid_data['tps_per_core'].idxmax()]
+            if i >= 0:
+                # 按位置只取所需列的标量，不构造整行 Series
+                best = {c: normalized_df[c].iat[i] for c in ('component', 'tps_per_core', 'tps_per_gb_memory', 'tps', 'latency_ms')}
                 
                 # 计算所需核心数
                 required_cores = int(np.ceil(target_tps / best['tps_per_core']))
@@ -283,16 +627,18 @@ class NormalizedMetrics:
             # 基于消息吞吐需求反推
             target_msg_per_sec = target_slo.get('target_msg_per_sec', 0)
             max_p95 = target_slo.get('max_p95_ms', 2000)
+            if target_msg_per_sec <= 0:
+                return pd.DataFrame(recommendations)
             
-            # 找到满足延迟要求的基准数据
-            valid_data = normalized_df[
-                (normalized_df['component_type'] == 'MQ') &
-                (normalized_df['worst_p95_ms'] <= max_p95)
-            ]
+            # 在满足延迟要求的基准数据中，使用最佳性能数据
+            i = _best_row_index(normalized_df, 'MQ', 'msg_per_sec_per_core', 'worst_p95_ms', max_p95)
             
-            if len(valid_data) > 0:
-                # 使用最佳性能数据
-                best = valid_data.loc[valid_data['msg_per_sec_per_core'].idxmax()]
+            if i >= 0:
+                # 按位置只取所需列的标量
+                best = {
+                    c: normalized_df[c].iat[i]
+                    for c in ('component', 'msg_per_sec_per_core', 'msg_per_sec_per_gb_memory', 'worst_p95_ms', 'avg_received_msg_s')
+                }
                 
                 # 计算所需核心数
                 required_cores = int(np.ceil(target_msg_per_sec / best['msg_per_sec_per_core']))
@@ -319,6 +665,56 @@ class NormalizedMetrics:
         return pd.DataFrame(recommendations)
 
 
+@functools.lru_cache(maxsize=None)
+def _polars():
+    """按需导入 polars（可选依赖，仅 --engine polars 使用），缺失时返回 None"""
+    try:
+        import polars as pl
+    except ImportError:
+        return None
+    return pl
+
+
+def _scan_csv(path, dtypes: Dict[str, str]) -> "pl.LazyFrame":
+    """惰性扫描 CSV；'str' 列固定为字符串"""
+    pl = _polars()
+    return pl.scan_csv(path, schema_overrides={c: pl.String for c, t in dtypes.items() if t == 'str'})
+
+
+def _main_polars(args, normalizer: NormalizedMetrics, output_dir: pathlib.Path, timestamp: str) -> None:
+    """--engine polars：scan_csv → filter → 列运算 → sink_csv 全程惰性/流式执行，不经过 pandas"""
+    pl = _polars()
+    lazy_frames = {}
+    for csv_arg, kind, dtypes, normalize, prefix, component in (
+        (args.db_csv, "数据库", DB_DTYPES, normalizer.normalize_db_lazy, "db", args.component_name_db),
+        (args.mq_summary_csv, "消息队列", MQ_DTYPES, normalizer.normalize_mq_lazy, "mq", args.component_name_mq),
+    ):
+        if not csv_arg:
+            continue
+        path = pathlib.Path(csv_arg)
+        if not path.exists():
+            print(f"警告: {kind}CSV文件不存在: {path}")
+            continue
+        print(f"处理{kind}测试结果: {path}")
+        lazy_frames[f"{prefix}_{component}"] = normalize(_scan_csv(path, dtypes), component)
+    
+    if not lazy_frames:
+        print("错误: 没有找到有效的测试数据文件")
+        return
+    
+    for name, lf in lazy_frames.items():
+        output_file = output_dir / f"normalized_{name}_{timestamp}.csv"
+        lf.sink_csv(output_file)
+        print(f"  已保存归一化指标: {output_file}")
+    
+    if args.emit_combined:
+        combined_file = output_dir / f"normalized_all_{timestamp}.csv"
+        pl.concat(list(lazy_frames.values()), how='diagonal').sink_csv(combined_file)
+        print(f"\n合并归一化指标已保存: {combined_file}")
+    
+    print("\n（polars 引擎不输出统计摘要，如需摘要请使用默认的 pandas 引擎）")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="归一化建模：将测试结果转换为可外推的单位指标"
@@ -363,8 +759,21 @@ def main():
         default='RabbitMQ',
         help='消息队列组件名称（默认：RabbitMQ）'
     )
+    parser.add_argument(
+        '--engine',
+        choices=['pandas', 'polars'],
+        default='pandas',
+        help='计算引擎：pandas（默认，输出统计摘要）或 polars（惰性流式执行，需安装 polars）'
+    )
+    parser.add_argument(
+        '--emit-combined',
+        action='store_true',
+        help='额外输出合并文件 normalized_all_*.csv（默认仅输出各组件文件）'
+    )
     
     args = parser.parse_args()
+    if args.engine == 'polars' and _polars() is None:
+        parser.error("--engine polars 需要安装 polars（pip install polars）")
     
     # 创建归一化计算器
     normalizer = NormalizedMetrics(
@@ -376,67 +785,72 @@ def main():
     output_dir.mkdir(exist_ok=True)
     
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    all_normalized = []
     
-    # 处理数据库数据
+    if args.engine == 'polars':
+        _main_polars(args, normalizer, output_dir, timestamp)
+        return
+    
+    # 读取输入
+    db_df = mq_df = None
     if args.db_csv:
         db_path = pathlib.Path(args.db_csv)
         if db_path.exists():
             print(f"处理数据库测试结果: {db_path}")
-            db_df = pd.read_csv(db_path)
-            db_normalized = normalizer.normalize_db_metrics(db_df, args.component_name_db)
-            all_normalized.append(db_normalized)
-            
-            output_file = output_dir / f"normalized_db_{args.component_name_db}_{timestamp}.csv"
-            db_normalized.to_csv(output_file, index=False, encoding='utf-8')
-            print(f"  已保存归一化指标: {output_file}")
-            print(f"  共 {len(db_normalized)} 条记录")
+            db_df = read_columns(db_path, DB_COLS, DB_DTYPES)
         else:
             print(f"警告: 数据库CSV文件不存在: {db_path}")
     
-    # 处理消息队列数据
     if args.mq_summary_csv:
         mq_path = pathlib.Path(args.mq_summary_csv)
         if mq_path.exists():
             print(f"处理消息队列测试结果: {mq_path}")
-            mq_df = pd.read_csv(mq_path)
-            mq_normalized = normalizer.normalize_mq_metrics(mq_df, args.component_name_mq)
-            all_normalized.append(mq_normalized)
-            
-            output_file = output_dir / f"normalized_mq_{args.component_name_mq}_{timestamp}.csv"
-            mq_normalized.to_csv(output_file, index=False, encoding='utf-8')
-            print(f"  已保存归一化指标: {output_file}")
-            print(f"  共 {len(mq_normalized)} 条记录")
+            mq_df = read_columns(mq_path, MQ_COLS, MQ_DTYPES)
         else:
             print(f"警告: 消息队列CSV文件不存在: {mq_path}")
     
-    # 合并所有归一化结果
+    # 归一化；各组件文件与（可选的）合并文件并行写出
+    frames = normalizer.normalize_all(db_df, mq_df, args.component_name_db, args.component_name_mq)
+    all_normalized = list(frames.values())
+    outputs = dict(frames)
+    # 合并文件按需输出：各帧列几乎不相交，合并只会得到大量空值列
+    if args.emit_combined and all_normalized:
+        outputs["all"] = concat_tables(all_normalized)
+    paths = write_outputs(outputs, output_dir, timestamp)
+    for key in frames:
+        print(f"  已保存归一化指标: {paths[key]}")
+        print(f"  共 {len(frames[key])} 条记录")
+    if "all" in paths:
+        print(f"\n合并归一化指标已保存: {paths['all']}")
+        print(f"总计 {len(outputs['all'])} 条记录")
+    del outputs
+    
     if all_normalized:
-        combined = pd.concat(all_normalized, ignore_index=True)
-        combined_file = output_dir / f"normalized_all_{timestamp}.csv"
-        combined.to_csv(combined_file, index=False, encoding='utf-8')
-        print(f"\n合并归一化指标已保存: {combined_file}")
-        print(f"总计 {len(combined)} 条记录")
-        
-        # 打印统计摘要
+        # 打印统计摘要：逐帧 groupby 聚合，无需构造合并 DataFrame
         print("\n=== 归一化指标统计摘要 ===")
-        for comp_type in combined['component_type'].unique():
-            comp_data = combined[combined['component_type'] == comp_type]
-            print(f"\n{comp_type} 组件 ({comp_data['component'].iloc[0]}):")
+        frame_stats = [
+            frame.groupby('component_type', sort=False, observed=True).agg(
+                {c: funcs for c, funcs in SUMMARY_AGGS.items() if c in frame.columns}
+            )
+            for frame in all_normalized if len(frame) > 0
+        ]
+        stats = pd.concat(frame_stats) if frame_stats else pd.DataFrame()
+        for comp_type in stats.index:
+            comp_stats = stats.loc[comp_type]
+            print(f"\n{comp_type} 组件 ({comp_stats[('component', 'first')]}):")
             
             if comp_type == 'DB':
-                print(f"  TPS/核心: 平均 {comp_data['tps_per_core'].mean():.2f}, "
-                      f"最大 {comp_data['tps_per_core'].max():.2f}")
-                print(f"  TPS/GB内存: 平均 {comp_data['tps_per_gb_memory'].mean():.2f}, "
-                      f"最大 {comp_data['tps_per_gb_memory'].max():.2f}")
-                print(f"  延迟/事务: 平均 {comp_data['latency_per_tx_ms'].mean():.2f} ms")
+                print(f"  TPS/核心: 平均 {comp_stats[('tps_per_core', 'mean')]:.2f}, "
+                      f"最大 {comp_stats[('tps_per_core', 'max')]:.2f}")
+                print(f"  TPS/GB内存: 平均 {comp_stats[('tps_per_gb_memory', 'mean')]:.2f}, "
+                      f"最大 {comp_stats[('tps_per_gb_memory', 'max')]:.2f}")
+                print(f"  延迟/事务: 平均 {comp_stats[('latency_per_tx_ms', 'mean')]:.2f} ms")
             
             elif comp_type == 'MQ':
-                print(f"  消息/秒/核心: 平均 {comp_data['msg_per_sec_per_core'].mean():.2f}, "
-                      f"最大 {comp_data['msg_per_sec_per_core'].max():.2f}")
-                print(f"  消息/秒/GB内存: 平均 {comp_data['msg_per_sec_per_gb_memory'].mean():.2f}, "
-                      f"最大 {comp_data['msg_per_sec_per_gb_memory'].max():.2f}")
-                print(f"  P95延迟: 平均 {comp_data['worst_p95_ms'].mean():.2f} ms")
+                print(f"  消息/秒/核心: 平均 {comp_stats[('msg_per_sec_per_core', 'mean')]:.2f}, "
+                      f"最大 {comp_stats[('msg_per_sec_per_core', 'max')]:.2f}")
+                print(f"  消息/秒/GB内存: 平均 {comp_stats[('msg_per_sec_per_gb_memory', 'mean')]:.2f}, "
+                      f"最大 {comp_stats[('msg_per_sec_per_gb_memory', 'max')]:.2f}")
+                print(f"  P95延迟: 平均 {comp_stats[('worst_p95_ms', 'mean')]:.2f} ms")
     
     else:
         print("错误: 没有找到有效的测试数据文件")
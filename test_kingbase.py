@@ -8,6 +8,7 @@
   3) CSV 输出字段：timestamp, clients, jobs, duration_s, tps_including, tps_excluding,
                     latency_ms_avg, tx_processed, return_code, error
   4) 仍可像原脚本一样只跑一次（未提供扫描参数时）
+  5) --parallel K 以进程池并行执行互相独立的 (clients, repeat) 任务（仅适用于压测目标互相隔离的场景）
 
 示例：
 python kbbench_sweep.py \
@@ -24,41 +25,173 @@ python kbbench_sweep.py \
 """
 
 import subprocess
-import shlex
 import re
 import sys
 import argparse
 import csv
 import os
 import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
-from typing import Optional, Tuple, Dict, Any, List
-
-TPS_INC_RE = re.compile(r"tps\s*=\s*([0-9.]+)\s*\(including", re.IGNORECASE)
-TPS_EXC_RE = re.compile(r"tps\s*=\s*([0-9.]+)\s*\(excluding", re.IGNORECASE)
-LAT_AVG_RE = re.compile(r"latency\s+average\s*=\s*([0-9.]+)\s*ms", re.IGNORECASE)
-TX_PROC_RE = re.compile(r"number\s+of\s+transactions\s+actually\s+processed:\s*([0-9]+)", re.IGNORECASE)
-
-
-def parse_tps(text: str) -> Tuple[Optional[float], Optional[float]]:
-    inc = exc = None
-    m = TPS_INC_RE.search(text)
-    if m:
-        inc = float(m.group(1))
-    m = TPS_EXC_RE.search(text)
-    if m:
-        exc = float(m.group(1))
-    return inc, exc
+from typing import Optional, Tuple, Dict, Any, List, Deque, Sequence
+
+try:
+    import hyperscan  # 可选：DFA 多模式匹配，单次线性扫描且无回溯
+except ImportError:
+    hyperscan = None
+
+try:
+    import numba  # 可选：--fast-parse 使用的 JIT 字节扫描器
+    import numpy as np
+except ImportError:
+    numba = None
+
+# 单次扫描即可提取全部指标：每个分支只含一个命名分组，m.lastgroup 即指标名
+METRICS_RE = re.compile(
+    r"tps\s*=\s*(?P<tps_including>[0-9.]+)\s*\(including"
+    r"|tps\s*=\s*(?P<tps_excluding>[0-9.]+)\s*\(excluding"
+    r"|latency\s+average\s*=\s*(?P<latency_ms_avg>[0-9.]+)\s*ms"
+    r"|number\s+of\s+transactions\s+actually\s+processed:\s*(?P<tx_processed>[0-9]+)",
+    re.IGNORECASE,
+)
+
+# hyperscan 表达式与指标一一对应，表达式 id 即下标；数值由 _extract_number 从匹配位置重新读取
+HS_METRICS = ("tps_including", "tps_excluding", "latency_ms_avg", "tx_processed")
+HS_EXPRESSIONS = [
+    rb"tps\s*=\s*[0-9.]+\s*\(including",
+    rb"tps\s*=\s*[0-9.]+\s*\(excluding",
+    rb"latency\s+average\s*=\s*[0-9.]+\s*ms",
+    rb"number\s+of\s+transactions\s+actually\s+processed:\s*[0-9]+",
+]
+
+
+def _compile_hs_db():
+    if hyperscan is None:
+        return None
+    db = hyperscan.Database()
+    db.compile(
+        expressions=HS_EXPRESSIONS,
+        ids=list(range(len(HS_EXPRESSIONS))),
+        elements=len(HS_EXPRESSIONS),
+        # SOM_LEFTMOST：回调中拿到匹配起点，便于定位数值
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST] * len(HS_EXPRESSIONS),
+    )
+    return db
+
+
+HS_DB = _compile_hs_db()
+
+# --fast-parse：逐字节匹配字面量锚点并手工解析数字（kbbench 输出为小写，按大小写敏感匹配）
+_LIT_TPS = b"tps"
+_LIT_INCLUDING = b"(including"
+_LIT_EXCLUDING = b"(excluding"
+_LIT_LATENCY = b"latency average"
+_LIT_MS = b"ms"
+_LIT_TX = b"number of transactions actually processed:"
+if numba is not None:
+    _LIT_TPS, _LIT_INCLUDING, _LIT_EXCLUDING, _LIT_LATENCY, _LIT_MS, _LIT_TX = (
+        np.frombuffer(x, dtype=np.uint8)
+        for x in (_LIT_TPS, _LIT_INCLUDING, _LIT_EXCLUDING, _LIT_LATENCY, _LIT_MS, _LIT_TX)
+    )
 
 
-def parse_latency(text: str) -> Optional[float]:
-    m = LAT_AVG_RE.search(text)
-    return float(m.group(1)) if m else None
+def _match_lit(buf, i, lit):
+    n = lit.shape[0]
+    if i + n > buf.shape[0]:
+        return False
+    for k in range(n):
+        if buf[i + k] != lit[k]:
+            return False
+    return True
+
+
+def _skip_ws(buf, i):
+    while i < buf.shape[0] and (buf[i] == 32 or buf[i] == 9):  # ' ', '\t'
+        i += 1
+    return i
+
+
+def _read_number(buf, i):
+    """读取 [0-9.]+，返回 (数值, 结束位置)；无数字时结束位置不变。整数尾数除以 10 的幂，与 float(str) 结果一致"""
+    mant = 0
+    frac_digits = 0
+    seen_dot = False
+    j = i
+    while j < buf.shape[0]:
+        ch = buf[j]
+        if 48 <= ch <= 57:
+            mant = mant * 10 + (ch - 48)
+            if seen_dot:
+                frac_digits += 1
+        elif ch == 46 and not seen_dot:  # '.'
+            seen_dot = True
+        else:
+            break
+        j += 1
+    return mant / 10.0 ** frac_digits, j
+
+
+def _scan_bytes(buf):
+    """单次遍历输出字节，返回 (tps_including, tps_excluding, latency_ms_avg, tx_processed)；缺失为 NaN / -1"""
+    inc = exc = lat = np.nan
+    tx = -1
+    i = 0
+    n = buf.shape[0]
+    while i < n:
+        if _match_lit(buf, i, _LIT_TPS):
+            j = _skip_ws(buf, i + _LIT_TPS.shape[0])
+            if j < n and buf[j] == 61:  # '='
+                k = _skip_ws(buf, j + 1)
+                value, end = _read_number(buf, k)
+                if end > k:
+                    end = _skip_ws(buf, end)
+                    if np.isnan(inc) and _match_lit(buf, end, _LIT_INCLUDING):
+                        inc = value
+                    elif np.isnan(exc) and _match_lit(buf, end, _LIT_EXCLUDING):
+                        exc = value
+        elif buf[i] == 108 and np.isnan(lat) and _match_lit(buf, i, _LIT_LATENCY):  # 'l'
+            j = _skip_ws(buf, i + _LIT_LATENCY.shape[0])
+            if j < n and buf[j] == 61:
+                k = _skip_ws(buf, j + 1)
+                value, end = _read_number(buf, k)
+                if end > k and _match_lit(buf, _skip_ws(buf, end), _LIT_MS):
+                    lat = value
+        elif buf[i] == 110 and tx < 0 and _match_lit(buf, i, _LIT_TX):  # 'n'
+            k = _skip_ws(buf, i + _LIT_TX.shape[0])
+            value, end = _read_number(buf, k)
+            if end > k:
+                tx = int(value)
+        i += 1
+    return inc, exc, lat, tx
+
+
+if numba is not None:
+    _match_lit = numba.njit(cache=True)(_match_lit)
+    _skip_ws = numba.njit(cache=True)(_skip_ws)
+    _read_number = numba.njit(cache=True)(_read_number)
+    scan_bytes = numba.njit(cache=True)(_scan_bytes)
+else:
+    scan_bytes = None
+
+# 容器内执行的脚本：写 ~/.pgpass → （可选）sys_encpwd → exec kbbench
+# 脚本为常量，所有连接/压测参数经 docker exec -e 以环境变量传入；KB_HOST / KB_PORT 为空时省略对应选项
+_BASH_SCRIPT = """set -euo pipefail
+umask 077
+printf '%s\\n' "$PGPASSLINE" > "$HOME/.pgpass"
+chmod 600 "$HOME/.pgpass"
+if command -v sys_encpwd >/dev/null 2>&1; then
+    sys_encpwd ${KB_HOST:+-H "$KB_HOST"} ${KB_PORT:+-P "$KB_PORT"} -D "$KB_DB" -U "$KB_USER" -W "$KINGBASE_PASSWORD" >/dev/null 2>&1 || true
+fi
+exec kbbench -h "$KB_HOST" -M extended -c "$KB_CLIENTS" -j "$KB_JOBS" -T "$KB_DURATION" -P "$KB_PROGRESS" \\
+    -d "$KB_DB" -U "$KB_USER" -r ${KB_PORT:+-p "$KB_PORT"}
+"""
 
 
-def parse_tx_processed(text: str) -> Optional[int]:
-    m = TX_PROC_RE.search(text)
-    return int(m.group(1)) if m else None
+# 失败时保留的输出尾部行数（写入 CSV 的 error 字段）
+TAIL_LINES = 200
+# parse_metrics 解析完整输出时优先扫描的末尾窗口大小
+PARSE_TAIL_CHARS = 4096
 
 
 def run_kbbench(
@@ -72,112 +205,226 @@ def run_kbbench(
     duration: int = 60,
     progress: int = 10,
     port: Optional[int] = None,
-) -> Tuple[int, str]:
+    echo: bool = False,
+    fast_parse: bool = False,
+) -> Tuple[int, Dict[str, Optional[float]], Optional[str]]:
     """
     在容器内：
       1) 写 ~/.pgpass（libpq 读取；支持 * 通配）
       2) 如有 sys_encpwd，则配置 ~/.encpwd（Kingbase 免密）
       3) 通过 PGPASSWORD / KINGBASE_PASSWORD 环境变量兜底
-      4) 执行 kbbench 并返回 (return_code, raw_output)
-    """
-    kb_cmd = [
-        "kbbench",
-        "-h", host,
-        "-M", "extended",
-        "-c", str(clients),
-        "-j", str(jobs),
-        "-T", str(duration),
-        "-P", str(progress),
-        "-d", db,
-        "-U", user,
-        "-r",
-    ]
-    if port is not None:
-        kb_cmd.extend(["-p", str(port)])
-
-    kb_cmd_str = " ".join(shlex.quote(x) for x in kb_cmd)
-
-    pgpass_line = f"{host}:{port if port is not None else '*'}:{db}:{user}:{password}"
+      4) 执行 kbbench，逐行读取输出并在线解析指标
 
-    bash_script = f"""
-        set -euo pipefail
-        umask 077
-
-        printf "%s\\n" "$PGPASSLINE" > "$HOME/.pgpass"
-        chmod 600 "$HOME/.pgpass"
-
-        if command -v sys_encpwd >/dev/null 2>&1; then
-            HOPT=""; POPT=""
-            if [ -n {shlex.quote(host)!r} ]; then HOPT="-H {shlex.quote(host)}"; fi
-            if [ -n {('' if port is None else str(port))!r} ]; then POPT="-P {port}"; fi
-            sys_encpwd $HOPT $POPT -D {shlex.quote(db)} -U {shlex.quote(user)} -W {shlex.quote(password)} >/dev/null 2>&1 || true
-        fi
-
-        exec {kb_cmd_str}
+    返回 (return_code, metrics, tail_on_error)：成功时 tail_on_error 为 None，
+    失败时为最后 TAIL_LINES 行输出；echo=True 时同步打印原始输出；
+    fast_parse 透传给 parse_metrics。
     """
+    pgpass_line = f"{host}:{port if port is not None else '*'}:{db}:{user}:{password}"
 
     docker_cmd = [
         "docker", "exec",
         "-e", f"PGPASSWORD={password}",
         "-e", f"KINGBASE_PASSWORD={password}",
         "-e", f"PGPASSLINE={pgpass_line}",
+        "-e", f"KB_HOST={host}",
+        "-e", f"KB_PORT={port if port is not None else ''}",
+        "-e", f"KB_DB={db}",
+        "-e", f"KB_USER={user}",
+        "-e", f"KB_CLIENTS={clients}",
+        "-e", f"KB_JOBS={jobs}",
+        "-e", f"KB_DURATION={duration}",
+        "-e", f"KB_PROGRESS={progress}",
         container,
-        "bash", "-lc", bash_script,
+        "bash", "-lc", _BASH_SCRIPT,
     ]
 
-    proc = subprocess.run(
+    metrics = parse_metrics("")
+    tail: Deque[str] = deque(maxlen=TAIL_LINES)
+    pending = True
+    with subprocess.Popen(
         docker_cmd,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
         text=True,
-    )
-    return proc.returncode, proc.stdout
-
-
-def parse_metrics(output: str) -> Dict[str, Optional[float]]:
-    inc, exc = parse_tps(output)
-    lat = parse_latency(output)
-    txc = parse_tx_processed(output)
-    return {
-        "tps_including": inc,
-        "tps_excluding": exc,
-        "latency_ms_avg": lat,
-        "tx_processed": txc,
-    }
-
-
-def ensure_header(path: str, fieldnames: List[str]) -> None:
-    need_header = not os.path.exists(path) or os.path.getsize(path) == 0
-    if need_header:
-        with open(path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-
-
-def append_row(path: str, fieldnames: List[str], row: Dict[str, Any]) -> None:
-    with open(path, "a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writerow(row)
-
-
-def expand_clients(args: argparse.Namespace) -> List[int]:
-    seq: List[int] = []
+        bufsize=1,
+    ) as proc:
+        try:
+            for line in proc.stdout:
+                if echo:
+                    print(line, end="")
+                tail.append(line)
+                # 四项指标均已取得后不再做正则匹配，仅继续排空管道；
+                # 指标行必含 '=' 或 'processed:'（kbbench 输出为小写），progress 行两者皆无，先用子串测试快速跳过
+                if pending and ("=" in line or "processed:" in line):
+                    parse_metrics(line, metrics, fast=fast_parse)
+                    pending = None in metrics.values()
+        except BaseException:
+            # 解析异常或 Ctrl-C：先结束子进程，避免退出 with 时阻塞等待压测跑完
+            proc.kill()
+            raise
+    if proc.returncode == 0:
+        return proc.returncode, metrics, None
+    return proc.returncode, metrics, "".join(tail)
+
+
+def _extract_number(buf: bytes, start: int) -> bytes:
+    """从匹配起点向后找到 '=' 或 ':'，返回其后的第一个数字（不依赖匹配终点，数字可能尚未匹配完整）"""
+    i = start
+    while buf[i] not in b"=:":
+        i += 1
+    i += 1
+    while buf[i] in b" \t":
+        i += 1
+    j = i
+    while j < len(buf) and buf[j] in b"0123456789.":
+        j += 1
+    return buf[i:j]
+
+
+def _parse_metrics_hs(output: str, metrics: Dict[str, Optional[float]]) -> None:
+    buf = output.encode("utf-8", errors="replace")
+
+    def on_match(expr_id, start, end, flags, context):
+        key = HS_METRICS[expr_id]
+        if metrics[key] is None:
+            value = _extract_number(buf, start)
+            metrics[key] = int(value) if key == "tx_processed" else float(value)
+            # 四项均已取得则终止扫描
+            if None not in metrics.values():
+                return True
+        return None
+
+    try:
+        HS_DB.scan(buf, match_event_handler=on_match)
+    except hyperscan.ScanTerminated:
+        pass
+
+
+def _parse_metrics_fast(output: str, metrics: Dict[str, Optional[float]]) -> None:
+    inc, exc, lat, tx = scan_bytes(np.frombuffer(output.encode("utf-8", errors="replace"), dtype=np.uint8))
+    for key, value in (("tps_including", inc), ("tps_excluding", exc), ("latency_ms_avg", lat)):
+        if metrics[key] is None and value == value:  # 非 NaN
+            metrics[key] = float(value)
+    if metrics["tx_processed"] is None and tx >= 0:
+        metrics["tx_processed"] = int(tx)
+
+
+def _scan_metrics(output: str, metrics: Dict[str, Optional[float]], fast: bool) -> None:
+    if fast and scan_bytes is not None:
+        _parse_metrics_fast(output, metrics)
+    elif HS_DB is not None:
+        _parse_metrics_hs(output, metrics)
+    else:
+        for m in METRICS_RE.finditer(output):
+            key = m.lastgroup
+            # 与 re.search 一致：只取首次出现的值
+            if metrics[key] is None:
+                value = m.group(key)
+                metrics[key] = int(value) if key == "tx_processed" else float(value)
+
+
+def parse_metrics(
+    output: str,
+    metrics: Optional[Dict[str, Optional[float]]] = None,
+    fast: bool = False,
+) -> Dict[str, Optional[float]]:
+    """
+    解析 kbbench 输出；传入 metrics 时只填充其中尚未取得（None）的指标。
+    fast=True 且已安装 numba 时使用 JIT 字节扫描器，否则依次回退到 hyperscan / 正则。
+    kbbench 在结尾打印汇总，较长的完整输出先只扫描末尾 PARSE_TAIL_CHARS 个字符，仍缺失的指标再扫描全文。
+    """
+    if metrics is None:
+        metrics = {
+            "tps_including": None,
+            "tps_excluding": None,
+            "latency_ms_avg": None,
+            "tx_processed": None,
+        }
+    if len(output) > PARSE_TAIL_CHARS:
+        tail = output[-PARSE_TAIL_CHARS:]
+        # 从窗口内第一个完整行开始
+        _scan_metrics(tail[tail.find("\n") + 1:], metrics, fast)
+        if all(v is not None for v in metrics.values()):
+            return metrics
+    _scan_metrics(output, metrics, fast)
+    return metrics
+
+
+def needs_header(path: str) -> bool:
+    return not os.path.exists(path) or os.path.getsize(path) == 0
+
+
+def expand_clients(args: argparse.Namespace) -> Sequence[int]:
+    """返回并发档位序列；区间模式直接返回 range，不展开为列表"""
     if args.clients_seq:
         try:
             seq = [int(x) for x in args.clients_seq.split(",") if x.strip()]
         except ValueError:
             raise SystemExit("--clients-seq 需要逗号分隔的整数，例如 4,8,16,32")
+        if not seq:
+            raise SystemExit("--clients-seq 至少需要一个并发值")
     elif args.clients_start is not None and args.clients_end is not None:
         step = args.clients_step or 1
         if step <= 0:
             raise SystemExit("--clients-step 必须为正整数")
-        seq = list(range(args.clients_start, args.clients_end + 1, step))
+        if args.clients_end < args.clients_start:
+            raise SystemExit("--clients-end 不能小于 --clients-start")
+        return range(args.clients_start, args.clients_end + 1, step)
     else:
         # 回退到单次运行
         seq = [args.clients]
     return seq
 
 
+def _iso(ts_ns: int) -> str:
+    """epoch 纳秒 -> 本地时间 ISO 字符串（精确到秒）"""
+    return datetime.fromtimestamp(ts_ns // 1_000_000_000).isoformat(timespec="seconds")
+
+
+def _one_run(args: argparse.Namespace, c: int, r: int) -> Dict[str, Any]:
+    """执行一次 kbbench（并发 c，第 r 轮）并返回 CSV 行；timestamp 取自执行该任务的进程"""
+    ts = _iso(time.time_ns())
+    if args.print_output:
+        print("\n=== RUN @", ts, f"c={c} (round {r}/{args.repeats}) ===")
+    try:
+        rc, metrics, tail_on_error = run_kbbench(
+            container=args.container,
+            password=args.password,
+            host=args.host,
+            db=args.db,
+            user=args.user,
+            clients=c,
+            jobs=args.jobs,
+            duration=args.duration,
+            progress=args.progress,
+            port=args.port,
+            echo=args.print_output,
+            fast_parse=args.fast_parse,
+        )
+    except Exception as e:
+        rc = 1
+        tail_on_error = str(e)
+        metrics = parse_metrics(tail_on_error)
+        if args.print_output:
+            print(tail_on_error)
+
+    if args.print_output:
+        print("=== END RUN ===\n")
+
+    return {
+        "timestamp": ts,
+        "clients": c,
+        "jobs": args.jobs,
+        "duration_s": args.duration,
+        "tps_including": metrics["tps_including"],
+        "tps_excluding": metrics["tps_excluding"],
+        "latency_ms_avg": metrics["latency_ms_avg"],
+        "tx_processed": metrics["tx_processed"],
+        "return_code": rc,
+        "error": None if rc == 0 else (tail_on_error or "unknown error"),
+    }
+
+
 def main():
     ap = argparse.ArgumentParser(description="在 Docker 容器中逐步增加 kbbench 并发并将结果保存到 CSV")
     # 连接/运行参数
@@ -204,12 +451,24 @@ def main():
     ap.add_argument("--repeats", type=int, default=1, help="每个并发跑几次")
     ap.add_argument("--cooldown", type=float, default=2.0, help="相邻两次运行之间的冷却秒数")
     ap.add_argument("--print_output", action="store_true", help="同时打印 kbbench 原始输出")
+    ap.add_argument(
+        "--fast-parse", action="store_true",
+        help="使用 numba JIT 字节扫描器解析输出（需安装 numba，适用于超长时长/高频进度输出；未安装时回退到正则）",
+    )
+    ap.add_argument(
+        "--parallel", type=int, default=1,
+        help="并行运行的 kbbench 任务数（默认 1 串行）；>1 时不保证冷却间隔，仅在压测目标互相隔离时使用",
+    )
 
     # 输出：默认保存到 datas/ 并包含组件名称
     ap.add_argument("--component-name", default="KingbaseES", help="组件名称，写入文件名")
     ap.add_argument("--out", default=None, help="结果 CSV 文件路径（留空则按组件名保存到 datas/）")
 
     args = ap.parse_args()
+    start_ns = time.time_ns()
+
+    if args.fast_parse and scan_bytes is None:
+        print("警告: 未安装 numba，--fast-parse 回退到常规解析", file=sys.stderr)
 
     fieldnames = [
         "timestamp",
@@ -227,55 +486,41 @@ def main():
     # 计算输出文件名
     if not args.out:
         os.makedirs("datas", exist_ok=True)
-        default_name = f"{args.component_name}_kbbench_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        start = datetime.fromtimestamp(start_ns // 1_000_000_000)
+        default_name = f"{args.component_name}_kbbench_results_{start.strftime('%Y%m%d_%H%M%S')}.csv"
         args.out = os.path.join("datas", default_name)
 
-    ensure_header(args.out, fieldnames)
-
     client_list = expand_clients(args)
 
-    for c in client_list:
-        for r in range(1, args.repeats + 1):
-            ts = datetime.now().isoformat(timespec="seconds")
-            try:
-                rc, out = run_kbbench(
-                    container=args.container,
-                    password=args.password,
-                    host=args.host,
-                    db=args.db,
-                    user=args.user,
-                    clients=c,
-                    jobs=args.jobs,
-                    duration=args.duration,
-                    progress=args.progress,
-                    port=args.port,
-                )
-            except Exception as e:
-                rc = 1
-                out = str(e)
-
-            if args.print_output:
-                print("\n=== RUN @", ts, f"c={c} (round {r}/{args.repeats}) ===")
-                print(out)
-                print("=== END RUN ===\n")
-
-            metrics = parse_metrics(out)
-            row = {
-                "timestamp": ts,
-                "clients": c,
-                "jobs": args.jobs,
-                "duration_s": args.duration,
-                "tps_including": metrics["tps_including"],
-                "tps_excluding": metrics["tps_excluding"],
-                "latency_ms_avg": metrics["latency_ms_avg"],
-                "tx_processed": metrics["tx_processed"],
-                "return_code": rc,
-                "error": None if rc == 0 else (out[:5000] if out else "unknown error"),
-            }
-            append_row(args.out, fieldnames, row)
-
-            if (c != client_list[-1]) or (r != args.repeats):
-                time.sleep(max(0.0, args.cooldown))
+    # 整个扫描期间只打开一次输出文件，复用同一个 DictWriter
+    write_header = needs_header(args.out)
+    with open(args.out, "a", newline="", encoding="utf-8", buffering=1 << 16) as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        if write_header:
+            writer.writeheader()
+
+        if args.parallel > 1:
+            # 并行模式：各 (clients, repeat) 任务互相独立，按完成顺序写入；不保证冷却间隔
+            with ProcessPoolExecutor(max_workers=args.parallel) as ex:
+                futures = [
+                    ex.submit(_one_run, args, c, r)
+                    for c in client_list
+                    for r in range(1, args.repeats + 1)
+                ]
+                for fut in as_completed(futures):
+                    writer.writerow(fut.result())
+                    f.flush()
+        else:
+            last_c = client_list[-1]
+            for c in client_list:
+                for r in range(1, args.repeats + 1):
+                    writer.writerow(_one_run(args, c, r))
+
+                    if (c != last_c) or (r != args.repeats):
+                        time.sleep(max(0.0, args.cooldown))
+
+                # 每个并发档位结束后落盘一次，中途崩溃也能保留已完成的数据
+                f.flush()
 
     print(f"结果已写入: {args.out}")
 